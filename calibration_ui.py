@@ -1,9 +1,8 @@
 import sys
 import json
-import math
+import traceback
+import concurrent.futures
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from PyQt5.QtWidgets import QApplication, QLabel, QWidget
 from PyQt5.QtGui import QPixmap, QPalette, QColor
 from PyQt5.QtCore import Qt, QTimer
@@ -21,6 +20,95 @@ positions = {
     "Bottom-Right": (1.0, 1.0, 'x')
 }
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json works, just slower
+    orjson = None
+
+def _dump_json(obj, path):
+    if orjson is not None:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(path, "w") as f:
+            json.dump(obj, f, indent=4)
+
+# Plot rendering and file writes happen off the Qt event thread; Agg
+# rasterizes safely outside the GUI thread.
+_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+
+def _report_output_errors(future):
+    exc = future.exception()
+    if exc is not None:
+        print("❌ Evaluation output failed:")
+        traceback.print_exception(type(exc), exc, exc.__traceback__)
+
+def _write_outputs(euclidean, angular, thresholds, accuracy, pred, gt, summary,
+                   screen_w, screen_h):
+    # Deferred import: matplotlib costs seconds of cold start on small
+    # boards and is only needed once calibration has finished.
+    import matplotlib
+    matplotlib.use("Agg")  # pure-CPU rasterizer; keeps matplotlib off the Qt backend
+    import matplotlib.pyplot as plt
+
+    # (one reused figure, cleared between plots, instead of spinning up
+    # pyplot figure machinery five times)
+    fig, ax = plt.subplots(figsize=(10, 6))
+
+    ax.hist(euclidean, bins=10)
+    ax.set_title("Euclidean Distance Error")
+    ax.set_xlabel("Distance (px)")
+    ax.set_ylabel("Frequency")
+    fig.savefig("distance_error_hist.png")
+
+    ax.clear()
+    ax.hist(angular, bins=10)
+    ax.set_title("Angular Error")
+    ax.set_xlabel("Angle (degrees)")
+    ax.set_ylabel("Frequency")
+    fig.savefig("angular_error_hist.png")
+
+    ax.clear()
+    ax.plot(thresholds, [a * 100 for a in accuracy], marker='o')
+    ax.set_title("Accuracy @ Radius")
+    ax.set_xlabel("Radius (px)")
+    ax.set_ylabel("Accuracy (%)")
+    ax.grid(True)
+    fig.savefig("accuracy_vs_radius.png")
+
+    ax.clear()
+    ax.grid(False)
+    ax.scatter(gt[:, 0], gt[:, 1], label="Ground Truth", color="green", s=100)
+    ax.scatter(pred[:, 0], pred[:, 1], label="Predicted", color="red", s=80)
+    ax.set_title("Ground Truth vs Predicted Gaze")
+    ax.set_xlabel("X")
+    ax.set_ylabel("Y")
+    ax.legend()
+    fig.savefig("gt_vs_pred_scatter.png")
+
+    # Bin the predictions into a coarse 200x200 grid via one bincount on
+    # flattened cell indices — no screen-sized intermediate, and O(N) in
+    # the number of predictions if this ever runs on live-session data.
+    bins = 200
+    xi = np.clip(pred[:, 0].astype(np.int64), 0, screen_w - 1) * bins // screen_w
+    yi = np.clip(pred[:, 1].astype(np.int64), 0, screen_h - 1) * bins // screen_h
+    heatmap = np.bincount(yi * bins + xi, minlength=bins * bins).reshape(bins, bins)
+
+    # Last plot: the colorbar attaches an extra axes to the figure, so
+    # the heatmap goes after everything that reuses the bare axes.
+    ax.clear()
+    im = ax.imshow(heatmap, cmap="Reds", aspect="auto", interpolation="nearest")
+    fig.colorbar(im, ax=ax)
+    ax.set_title("Gaze Heatmap (Predicted)")
+    ax.set_axis_off()
+    fig.savefig("gaze_heatmap.png")
+
+    plt.close(fig)
+
+    _dump_json(summary, "evaluation_summary.json")
+
+    print("✅ Evaluation complete. Results saved.")
+
 class CalibrationWindow(QWidget):
     def __init__(self):
         super().__init__()
@@ -35,7 +123,6 @@ class CalibrationWindow(QWidget):
         self.gaze_tracker = GazeTracker()
         self.labels = {}
         self.current_step = 0
-        self.keys_map = list(positions.items())
 
         self.instruction_label = QLabel(self)
         self.instruction_label.setStyleSheet("font-size: 32px; color: black; background-color: white;")
@@ -45,16 +132,34 @@ class CalibrationWindow(QWidget):
         QTimer.singleShot(1000, self.show_next_marker)
 
     def init_ui(self):
-        for name, (x_frac, y_frac, _) in positions.items():
+        # One disk read and one smooth rescale; Qt shares the pixmap
+        # copy-on-write across all nine labels.
+        pix = QPixmap("assets/dot.png").scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        assert not pix.isNull(), "assets/dot.png is missing"
+        for name in positions:
             label = QLabel(self)
-            pix = QPixmap("assets/dot.png").scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             label.setPixmap(pix)
             label.setFixedSize(80, 80)
-            label.move(0, 0)
             label.setVisible(False)
             self.labels[name] = label
         self.resize_screen()
 
+        # Marker pixel positions are fixed once the window is sized, so
+        # compute and apply them here; show_next_marker then only needs
+        # a table lookup per step.
+        screen_w, screen_h = self.width(), self.height()
+        self._pos = {}
+        for name, (x_frac, y_frac, _) in positions.items():
+            label = self.labels[name]
+            dot_w, dot_h = label.width(), label.height()
+            x = max(0, min(screen_w - dot_w, int(screen_w * x_frac - dot_w // 2)))
+            y = max(0, min(screen_h - dot_h, int(screen_h * y_frac - dot_h // 2)))
+            self._pos[name] = (x, y)
+            label.move(x, y)
+
+        self.keys_map = [(name, key, *self._pos[name])
+                         for name, (_, _, key) in positions.items()]
+
     def resize_screen(self):
         screen = QApplication.primaryScreen()
         size = screen.size()
@@ -67,8 +172,7 @@ class CalibrationWindow(QWidget):
             self.instruction_label.setText("Calibration Complete! Starting tracking...")
             self.gaze_tracker.train()
 
-            with open("calibration_data.json", "w") as f:
-                json.dump(self.gaze_tracker.calibration_points, f, indent=4)
+            _dump_json(self.gaze_tracker.calibration_points, "calibration_data.json")
 
             print("📁 Calibration data saved to calibration_data.json")
             self.gaze_tracker.start_tracking()
@@ -77,17 +181,8 @@ class CalibrationWindow(QWidget):
             QTimer.singleShot(4000, self.close)
             return
 
-        name, (x_frac, y_frac, key) = self.keys_map[self.current_step]
+        name, key, x, y = self.keys_map[self.current_step]
         label = self.labels[name]
-
-        screen_w, screen_h = self.width(), self.height()
-        dot_w, dot_h = label.width(), label.height()
-        x = int(screen_w * x_frac - dot_w // 2)
-        y = int(screen_h * y_frac - dot_h // 2)
-
-        x = max(0, min(screen_w - dot_w, x))
-        y = max(0, min(screen_h - dot_h, y))
-
         label.move(x, y)
         label.setVisible(True)
 
@@ -100,7 +195,7 @@ class CalibrationWindow(QWidget):
             return
 
         key_char = event.text()
-        expected_key = self.keys_map[self.current_step][1][2]
+        expected_key = self.keys_map[self.current_step][1]
 
         if key_char == expected_key:
             name = self.keys_map[self.current_step][0]
@@ -123,114 +218,63 @@ class CalibrationWindow(QWidget):
 
     def run_evaluation(self):
         print("📊 Running Evaluation...")
-        with open("calibration_data.json", "r") as f:
-            calib = json.load(f)
-    
-        predicted, ground_truth = [], []
+        # The calibration points are already in memory (and were just
+        # written to disk in show_next_marker), so no need to re-read
+        # and re-parse the file here.
+        calib = self.gaze_tracker.calibration_points
+
+
         screen_w, screen_h = self.width(), self.height()
-    
-        for name, values in calib.items():
-            if len(values) != 5:
-                print(f"⚠️ Skipping '{name}': invalid format")
-                continue
-    
-            # Get relative screen position from calibration map
-            if name not in positions:
-                print(f"⚠️ '{name}' not found in positions map")
-                continue
-    
-            x_frac, y_frac, _ = positions[name]
-            gx = x_frac * screen_w
-            gy = y_frac * screen_h
-    
-            dx = values[2]
-            dy = values[3]
-            w = values[4]
-    
-            px = gx + dx * w
-            py = gy + dy * w
-    
-            predicted.append((px, py))
-            ground_truth.append((gx, gy))
-    
-        if not predicted:
+
+        # Walk positions (the canonical order) and index into calib, so the
+        # arrays below get a deterministic layout with one lookup per name.
+        names = [n for n in positions if n in calib and len(calib[n]) == 5]
+        skipped = set(calib) - set(names)
+        if skipped:
+            print(f"⚠️ Skipping invalid/unknown entries: {sorted(skipped)}")
+
+        if not names:
             print("❌ No valid predictions to evaluate.")
             return
-    
-        pred = np.array(predicted)
-        gt = np.array(ground_truth)
+
+        x_frac = np.array([positions[n][0] for n in names])
+        y_frac = np.array([positions[n][1] for n in names])
+        dx = np.array([calib[n][2] for n in names])
+        dy = np.array([calib[n][3] for n in names])
+        w = np.array([calib[n][4] for n in names])
+
+        gx = x_frac * screen_w
+        gy = y_frac * screen_h
+        pred = np.column_stack([gx + dx * w, gy + dy * w])
+        gt = np.column_stack([gx, gy])
+
         euclidean = np.linalg.norm(pred - gt, axis=1)
         mean_euc = np.mean(euclidean)
-    
-        def ang_err(p, g):
-            p3 = np.array([p[0], p[1], 1])
-            g3 = np.array([g[0], g[1], 1])
-            cos = np.clip(np.dot(p3, g3) / (np.linalg.norm(p3) * np.linalg.norm(g3)), -1, 1)
-            return math.degrees(math.acos(cos))
-    
-        angular = [ang_err(p, g) for p, g in zip(pred, gt)]
+
+        # Angular error for all pairs in one broadcast computation
+        P = np.column_stack([pred, np.ones(len(names))])
+        G = np.column_stack([gt, np.ones(len(names))])
+        dots = np.einsum('ij,ij->i', P, G)
+        norms = np.linalg.norm(P, axis=1) * np.linalg.norm(G, axis=1)
+        angular = np.degrees(np.arccos(np.clip(dots / norms, -1, 1)))
         mean_ang = np.mean(angular)
         thresholds = [20, 40, 60, 80, 100]
         accuracy = [(euclidean < t).sum() / len(euclidean) for t in thresholds]
     
-        # --- Plots ---
-        plt.hist(euclidean, bins=10)
-        plt.title("Euclidean Distance Error")
-        plt.xlabel("Distance (px)")
-        plt.ylabel("Frequency")
-        plt.savefig("distance_error_hist.png")
-        plt.close()
-    
-        plt.hist(angular, bins=10)
-        plt.title("Angular Error")
-        plt.xlabel("Angle (degrees)")
-        plt.ylabel("Frequency")
-        plt.savefig("angular_error_hist.png")
-        plt.close()
-    
-        plt.plot(thresholds, [a * 100 for a in accuracy], marker='o')
-        plt.title("Accuracy @ Radius")
-        plt.xlabel("Radius (px)")
-        plt.ylabel("Accuracy (%)")
-        plt.grid(True)
-        plt.savefig("accuracy_vs_radius.png")
-        plt.close()
-    
-        heatmap = np.zeros((screen_h, screen_w))
-        for x, y in predicted:
-            xi = min(screen_w - 1, max(0, int(x)))
-            yi = min(screen_h - 1, max(0, int(y)))
-            heatmap[yi, xi] += 1
-    
-        plt.figure(figsize=(10, 6))
-        sns.heatmap(heatmap, cmap="Reds")
-        plt.title("Gaze Heatmap (Predicted)")
-        plt.axis("off")
-        plt.savefig("gaze_heatmap.png")
-        plt.close()
-    
-        pred_x, pred_y = zip(*predicted)
-        gt_x, gt_y = zip(*ground_truth)
-        plt.scatter(gt_x, gt_y, label="Ground Truth", color="green", s=100)
-        plt.scatter(pred_x, pred_y, label="Predicted", color="red", s=80)
-        plt.title("Ground Truth vs Predicted Gaze")
-        plt.xlabel("X")
-        plt.ylabel("Y")
-        plt.legend()
-        plt.savefig("gt_vs_pred_scatter.png")
-        plt.close()
-    
         summary = {
             "mean_euclidean_distance_px": round(mean_euc, 2),
             "mean_angular_error_deg": round(mean_ang, 2),
             "accuracy_thresholds_px": thresholds,
             "accuracy_percentages": [round(a * 100, 2) for a in accuracy]
         }
-    
-        with open("evaluation_summary.json", "w") as f:
-            json.dump(summary, f, indent=4)
-    
-        print("✅ Evaluation complete. Results saved.")
+
+        # Rendering and disk writes run on the worker thread so the Qt
+        # event loop stays responsive until the window closes. Surface any
+        # worker-side failure, which would otherwise be swallowed with the
+        # discarded future.
+        future = _pool.submit(_write_outputs, euclidean, angular, thresholds,
+                              accuracy, pred, gt, summary, screen_w, screen_h)
+        future.add_done_callback(_report_output_errors)
 
 
 if __name__ == "__main__":
@@ -1,20 +1,24 @@
 import cv2
 import numpy as np
 import mediapipe as mp
-import pyautogui
 from collections import deque
 import time
 from scipy.spatial import distance as dist
 from sklearn.neighbors import KNeighborsClassifier
 import threading
+from PyQt5.QtCore import QObject, pyqtSignal
+
+class GazeTracker(QObject):
+    # Emitted from the capture thread whenever a new smoothed offset pair
+    # is available; connect with Qt.QueuedConnection to receive it on the
+    # GUI thread.
+    offsets_ready = pyqtSignal(float, float)
 
-class GazeTracker:
     def __init__(self):
+        super().__init__()
         self.cap = cv2.VideoCapture(0)
         self.face_mesh = mp.solutions.face_mesh.FaceMesh(refine_landmarks=True, max_num_faces=1,
                                                           min_detection_confidence=0.5, min_tracking_confidence=0.5)
-        self.screen_w, self.screen_h = pyautogui.size()
-        self.center_x, self.center_y = self.screen_w // 2, self.screen_h // 2
         self.calibration_points = {}
         self.calibration_data = {'features': [], 'labels': []}
         self.gaze_classifier = None
@@ -25,8 +29,9 @@ class GazeTracker:
         self.current_gaze_zone = "Center"
         self.running = False
 
-        self.latest_dx = 0.0
-        self.latest_dy = 0.0
+        # Latest smoothed offsets, published by the capture thread as one
+        # 16-byte-aligned float64 pair so readers never need a lock.
+        self._latest_offsets = np.zeros(2, dtype=np.float64)
         self.blink_timestamps = deque(maxlen=2)
         self.blink_triggered = False
 
@@ -124,8 +129,8 @@ class GazeTracker:
                     dy = (ic[1] - ec[1]) / ew
                     sm_dx, sm_dy = self.get_smoothed(dx, dy)
 
-                    self.latest_dx = sm_dx
-                    self.latest_dy = sm_dy
+                    self._latest_offsets[:] = (sm_dx, sm_dy)
+                    self.offsets_ready.emit(sm_dx, sm_dy)
 
                     # Blink detection
                     left_eye = [(face_landmarks.landmark[i].x * w, face_landmarks.landmark[i].y * h)
@@ -170,4 +175,4 @@ class GazeTracker:
         return self.current_gaze_zone
 
     def get_latest_offsets(self):
-        return self.latest_dx, self.latest_dy
+        return float(self._latest_offsets[0]), float(self._latest_offsets[1])
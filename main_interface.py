@@ -1,9 +1,10 @@
 import sys
 import json
 import threading
-import pyautogui
+import numpy as np
 from PyQt5.QtWidgets import QApplication, QWidget, QStackedWidget, QVBoxLayout
-from PyQt5.QtCore import Qt, QTimer, QPoint, QElapsedTimer
+from PyQt5.QtCore import Qt, QPoint, QElapsedTimer
+from PyQt5.QtGui import QCursor
 from gaze_tracker import GazeTracker
 from screens.main_menu import MainMenuScreen
 from screens.food_screen import FoodScreen
@@ -12,9 +13,53 @@ from screens.tablets_screen import TabletsScreen
 from screens.washroom_screen import WashroomScreen
 from screens.final_message import FinalMessageScreen
 
+try:
+    import orjson
+except ImportError:  # optional; stdlib json works, just slower
+    orjson = None
+
 # Hardcoded or loaded calibration values
-with open("calibration_data.json", "r") as f:
-    calibration_points = json.load(f)
+with open("calibration_data.json", "rb") as f:
+    _raw = f.read()
+calibration_points = orjson.loads(_raw) if orjson is not None else json.loads(_raw)
+
+# calibration_points never changes after load, so the scalar columns
+# (dx, dy, eye width) are kept as one float64 array and the derived
+# range/center constants are computed once at import. Only the screen
+# scale factors still need the Qt screen size, so they stay in __init__.
+_CALIB_ARR = np.array([val[2:] for val in calibration_points.values()], dtype=np.float64)
+_DX_RANGE = max(np.ptp(_CALIB_ARR[:, 0]), 0.01)
+_DY_RANGE = max(np.ptp(_CALIB_ARR[:, 1]), 0.01)
+_CENTER_DX = calibration_points['Center'][2]
+_CENTER_DY = calibration_points['Center'][3]
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the plain function
+    def njit(*args, **kwargs):
+        if args and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True, fastmath=True)
+def _map_gaze(dx, dy, cx, cy, center_dx, center_dy, scale_x, scale_y,
+              dir_x, dir_y, prev_x, prev_y, screen_w, screen_h):
+    """Map smoothed gaze offsets to a clamped, EMA-smoothed cursor position."""
+    screen_x = cx + int(dir_x * (dx - center_dx) * scale_x)
+    screen_y = cy + int(dir_y * (dy - center_dy) * scale_y)
+    screen_x = max(0, min(screen_w - 1, screen_x))
+    screen_y = max(0, min(screen_h - 1, screen_y))
+    smooth_x = prev_x + 0.2 * (screen_x - prev_x)
+    smooth_y = prev_y + 0.2 * (screen_y - prev_y)
+    return screen_x, screen_y, smooth_x, smooth_y
+
+@njit(cache=True)
+def _hit(rects, x, y):
+    """Return the index of the first rect in (N, 4) containing (x, y), or -1."""
+    for i in range(rects.shape[0]):
+        if rects[i, 0] <= x < rects[i, 2] and rects[i, 1] <= y < rects[i, 3]:
+            return i
+    return -1
 
 class MainInterface(QWidget):
     def __init__(self):
@@ -23,6 +68,10 @@ class MainInterface(QWidget):
         self.setWindowState(Qt.WindowFullScreen)
 
         self.gaze_tracker = GazeTracker()
+        # Event-driven instead of a fixed 100 ms poll: the capture thread
+        # emits whenever a new sample lands, and the queued connection runs
+        # check_gaze on the GUI thread.
+        self.gaze_tracker.offsets_ready.connect(self.check_gaze, Qt.QueuedConnection)
         threading.Thread(target=self.gaze_tracker.start_tracking, daemon=True).start()
 
         self.stack = QStackedWidget()
@@ -45,77 +94,99 @@ class MainInterface(QWidget):
         self.stack.addWidget(self.washroom_screen)
         self.stack.addWidget(self.final_message_screen)
 
-        self.stack.setCurrentWidget(self.main_menu)
-        self.buttons = self.main_menu.buttons
+        self.switch_screen(self.main_menu)
+
+        # Calibration-derived constants: calibration_points is loaded once at
+        # import, so everything check_gaze needs can be computed here instead
+        # of on every timer tick.
+        size = QApplication.primaryScreen().size()
+        self._screen_w, self._screen_h = size.width(), size.height()
+        self._cx, self._cy = self._screen_w // 2, self._screen_h // 2
+
+        INVERT_X = True
+        INVERT_Y = False
+        self._dir_x = -1 if INVERT_X else 1
+        self._dir_y = -1 if INVERT_Y else 1
+
+        self._scale_x = min(self._screen_w / (_DX_RANGE * 0.8), 40000)
+        self._scale_y = min(self._screen_h / (_DY_RANGE * 0.8), 40000)
+        self._center_dx = _CENTER_DX
+        self._center_dy = _CENTER_DY
 
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.check_gaze)
-        self.timer.start(100)
         self.hovered_button = None
         self.hover_timer = QElapsedTimer()
-        self.prev_cursor_pos = pyautogui.position()
+        # We track the cursor ourselves as two float scalars (no tuple
+        # packing per tick, and no truncation drift in the smoothing).
+        self._prev_x = float(self._cx)
+        self._prev_y = float(self._cy)
 
     def switch_screen(self, screen_widget):
         self.stack.setCurrentWidget(screen_widget)
         self.buttons = getattr(screen_widget, "buttons", [])
+        self._btn_rects = None  # rebuilt lazily on the next gaze tick
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._btn_rects = None
+
+    def _rebuild_btn_rects(self):
+        # Cache every button's global rectangle as an (N, 4) array of
+        # [left, top, right, bottom] so the hit test is four vectorized
+        # comparisons instead of a mapToGlobal/QRect round-trip per button.
+        rects = []
+        for btn in self.buttons:
+            pos = btn.mapToGlobal(QPoint(0, 0))
+            rects.append([pos.x(), pos.y(), pos.x() + btn.width(), pos.y() + btn.height()])
+        self._btn_rects = np.array(rects, dtype=np.int32).reshape(-1, 4)
+
+        # Coarse 64 px spatial grid over the screen: each cell holds the
+        # index of the last button overlapping it, making the common-case
+        # lookup in check_gaze a single table read instead of a scan.
+        grid_h = (self._screen_h + 63) >> 6
+        grid_w = (self._screen_w + 63) >> 6
+        grid = -np.ones((grid_h, grid_w), dtype=np.int16)
+        for i, (left, top, right, bottom) in enumerate(self._btn_rects):
+            x0, x1 = max(0, left >> 6), min(grid_w - 1, (right - 1) >> 6)
+            y0, y1 = max(0, top >> 6), min(grid_h - 1, (bottom - 1) >> 6)
+            grid[y0:y1 + 1, x0:x1 + 1] = i
+        self._grid = grid
 
     def show_final_message(self, message):
         self.final_message_screen.set_message(message)
         self.switch_screen(self.final_message_screen)
 
-    def check_gaze(self):
-        smoothed_dx, smoothed_dy = self.gaze_tracker.get_latest_offsets()
-        screen_w, screen_h = pyautogui.size()
-        CENTER_X, CENTER_Y = screen_w // 2, screen_h // 2
-        pyautogui.FAILSAFE = False
-
-        INVERT_X = True
-        INVERT_Y = False
-        dir_x = -1 if INVERT_X else 1
-        dir_y = -1 if INVERT_Y else 1
-
-        all_dx = [val[2] for val in calibration_points.values()]
-        all_dy = [val[3] for val in calibration_points.values()]
-        dx_range = max(all_dx) - min(all_dx)
-        dy_range = max(all_dy) - min(all_dy)
-
-        dy_range = max(dy_range, 0.01)
-        dx_range = max(dx_range, 0.01)
-
-        SCALE_X = min(screen_w / (dx_range * 0.8), 40000)
-        SCALE_Y = min(screen_h / (dy_range * 0.8), 40000)
-
-        center_dx = calibration_points['Center'][2]
-        center_dy = calibration_points['Center'][3]
-        dx_relative = smoothed_dx - center_dx
-        dy_relative = smoothed_dy - center_dy
-
-        screen_x = CENTER_X + int(dir_x * dx_relative * SCALE_X)
-        screen_y = CENTER_Y + int(dir_y * dy_relative * SCALE_Y)
-        screen_x = max(0, min(screen_w - 1, screen_x))
-        screen_y = max(0, min(screen_h - 1, screen_y))
-
-        prev_x, prev_y = self.prev_cursor_pos
-        smooth_x = int(prev_x + 0.2 * (screen_x - prev_x))
-        smooth_y = int(prev_y + 0.2 * (screen_y - prev_y))
-        pyautogui.moveTo(smooth_x, smooth_y)
-
-        self.prev_cursor_pos = (smooth_x, smooth_y)
-
-        for btn in self.buttons:
-            btn_pos = btn.mapToGlobal(QPoint(0, 0))
-            btn_rect = btn.geometry()
-            btn_rect.moveTopLeft(btn_pos)
-
-            if btn_rect.contains(QPoint(screen_x, screen_y)):
-                if self.hovered_button != btn:
-                    self.hovered_button = btn
-                    self.hover_timer.restart()
-                else:
-                    if self.hover_timer.hasExpired(2000):
-                        btn.click()
-                        self.hover_timer.invalidate()
-                break
+    def check_gaze(self, smoothed_dx, smoothed_dy):
+        screen_x, screen_y, smooth_x, smooth_y = _map_gaze(
+            smoothed_dx, smoothed_dy, self._cx, self._cy,
+            self._center_dx, self._center_dy, self._scale_x, self._scale_y,
+            self._dir_x, self._dir_y, self._prev_x, self._prev_y,
+            self._screen_w, self._screen_h)
+        QCursor.setPos(int(smooth_x), int(smooth_y))
+
+        self._prev_x = smooth_x
+        self._prev_y = smooth_y
+
+        if self._btn_rects is None:
+            self._rebuild_btn_rects()
+
+        # Grid cells straddling a button edge are approximate, so confirm
+        # against the rect and rescan on a mismatch (rare for the
+        # non-overlapping menu layouts used here).
+        idx = int(self._grid[screen_y >> 6, screen_x >> 6])
+        if idx >= 0:
+            left, top, right, bottom = self._btn_rects[idx]
+            if not (left <= screen_x < right and top <= screen_y < bottom):
+                idx = int(_hit(self._btn_rects, screen_x, screen_y))
+
+        if idx >= 0:
+            btn = self.buttons[idx]
+            if self.hovered_button != btn:
+                self.hovered_button = btn
+                self.hover_timer.restart()
+            else:
+                if self.hover_timer.hasExpired(2000):
+                    btn.click()
+                    self.hover_timer.invalidate()
         else:
             self.hovered_button = None
             self.hover_timer.invalidate()